@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Shared logging setup for the OpenClaw bootstrap agents
+
+Agents log through the standard `logging` module. Records are pushed onto
+a queue and formatted/written by a background listener thread, so the
+monitoring loops never block on stdout.
+"""
+
+import logging
+import logging.handlers
+import queue
+from typing import Optional
+
+
+# One queue handler/listener pair per process, shared by every agent that
+# starts logging; torn down when the last of them stops
+_handler: Optional[logging.handlers.QueueHandler] = None
+_listener: Optional[logging.handlers.QueueListener] = None
+_users = 0
+
+
+def start_queue_logging(level: int = logging.INFO) -> logging.handlers.QueueListener:
+    """Route root logging through a queue drained by a background thread
+
+    Safe to call more than once: later calls reuse the running listener
+    instead of installing another handler. Pair every call with
+    `stop_queue_logging()`.
+    """
+    global _handler, _listener, _users
+
+    if _listener is None:
+        log_queue: queue.SimpleQueue = queue.SimpleQueue()
+
+        handler = logging.StreamHandler()
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        _listener = logging.handlers.QueueListener(log_queue, handler)
+        _handler = logging.handlers.QueueHandler(log_queue)
+
+        logging.getLogger().addHandler(_handler)
+        _listener.start()
+
+    logging.getLogger().setLevel(level)
+    _users += 1
+    return _listener
+
+
+def stop_queue_logging():
+    """Flush queued records and, for the last user, remove the queue handler"""
+    global _handler, _listener, _users
+
+    if _listener is None:
+        return
+    _users -= 1
+    if _users > 0:
+        return
+
+    logging.getLogger().removeHandler(_handler)
+    _listener.stop()
+    _handler = None
+    _listener = None
@@ -12,21 +12,36 @@ Features:
 """
 
 import asyncio
+import bisect
+import itertools
 import json
+import logging
+import math
 import os
+import sys
 import time
-from datetime import datetime
-from typing import Dict, List, Set
+from typing import Deque, Dict, Iterator, List, Set, Tuple
 from dataclasses import dataclass
-from collections import defaultdict
+from collections import defaultdict, deque
+
+from agent_logging import start_queue_logging, stop_queue_logging
+
+
+log = logging.getLogger("openclaw.network_booster")
+
+
+def _now() -> int:
+    """Monotonic clock in whole seconds"""
+    return time.monotonic_ns() // 1_000_000_000
 
 
 @dataclass
 class NetworkMetrics:
-    timestamp: datetime
+    timestamp: int
     connected_peers: int
     total_bandwidth_mbps: float
     avg_latency_ms: float
+    p99_latency_ms: float
     blocks_synced_per_minute: float
     failed_connections: int
     successful_connections: int
@@ -34,56 +49,81 @@ class NetworkMetrics:
     disk_usage_percent: float
 
 
+@dataclass(frozen=True, slots=True)
+class BoosterConfig:
+    """NetworkBooster settings, resolved once from the agent config"""
+    max_peers: int
+    max_outbound: int
+    max_inbound: int
+
+    @classmethod
+    def from_dict(cls, config: Dict) -> "BoosterConfig":
+        optimization = config.get("network_optimization", {})
+        pooling = optimization.get("connection_pooling", {})
+        return cls(
+            max_peers=optimization.get("peer_discovery", {}).get("max_peers", 50),
+            max_outbound=pooling.get("max_outbound_peers", 25),
+            max_inbound=pooling.get("max_inbound_peers", 25),
+        )
+
+
 class NetworkBooster:
     """Optimizes network performance for Axiom bootstrap node"""
 
     def __init__(self, config: Dict):
         self.config = config
-        self.metrics_history: List[NetworkMetrics] = []
+        # Fixed-size ring of the last 100 samples (≈50 minutes)
+        self.metrics_history: Deque[NetworkMetrics] = deque(maxlen=100)
         self.peer_latencies: Dict[str, float] = {}
+        # (latency_ms, peer_id) kept sorted alongside peer_latencies
+        self._latency_index: List[Tuple[float, str]] = []
+        self._latency_sum = 0.0
         self.throughput_stats: Dict[str, float] = defaultdict(float)
         self.congestion_detected = False
         
-        self.max_peers = config.get("network_optimization", {}).get("peer_discovery", {}).get("max_peers", 50)
-        self.max_outbound = config.get("network_optimization", {}).get("connection_pooling", {}).get("max_outbound_peers", 25)
-        self.max_inbound = config.get("network_optimization", {}).get("connection_pooling", {}).get("max_inbound_peers", 25)
+        self.settings = BoosterConfig.from_dict(config)
+        self.max_peers = self.settings.max_peers
+        self.max_outbound = self.settings.max_outbound
+        self.max_inbound = self.settings.max_inbound
+        
+        # Integer peer-count limits: below 80% of max_peers the pool is healthy,
+        # above 90% it gets pruned
+        self._peer_soft_limit = math.ceil(self.max_peers * 0.8)
+        self._peer_hard_limit = math.floor(self.max_peers * 0.9)
 
     async def optimize_network(self):
         """Continuous network optimization"""
-        print("[NetworkBooster] Starting network optimization...")
+        log.info("[NetworkBooster] Starting network optimization...")
         
         while True:
             try:
-                # Monitor network health
+                # Take this cycle's sample first; the other phases read it
                 await self.monitor_network_health()
                 
-                # Optimize peer connections
-                await self.optimize_peer_connections()
-                
-                # Optimize bandwidth
-                await self.optimize_bandwidth()
-                
-                # Detect and handle congestion
-                await self.detect_congestion()
+                # Tune peers/bandwidth and check congestion
+                await asyncio.gather(
+                    self.optimize_peer_connections(),
+                    self.optimize_bandwidth(),
+                    self.detect_congestion(),
+                )
                 
                 # Log metrics
                 self.log_network_metrics()
                 
                 await asyncio.sleep(30)  # Check every 30 seconds
             except Exception as e:
-                print(f"[NetworkBooster] Error: {e}")
+                log.error("[NetworkBooster] Error: %s", e)
                 await asyncio.sleep(10)
 
     async def monitor_network_health(self):
         """Monitor overall network health"""
-        print("📊 [Performance] Analyzing network health...")
-        
         # Collect metrics
         metrics = NetworkMetrics(
-            timestamp=datetime.utcnow(),
+            timestamp=_now(),
             connected_peers=len(self.peer_latencies),
             total_bandwidth_mbps=self.calculate_bandwidth(),
             avg_latency_ms=self.calculate_avg_latency(),
+            p99_latency_ms=self.calculate_latency_percentile(99),
             blocks_synced_per_minute=self.calculate_block_rate(),
             failed_connections=self.count_failed_connections(),
             successful_connections=self.count_successful_connections(),
@@ -93,71 +133,63 @@ class NetworkBooster:
         
         self.metrics_history.append(metrics)
         
-        # Keep only last 100 metrics (≈50 minutes)
-        if len(self.metrics_history) > 100:
-            self.metrics_history = self.metrics_history[-100:]
-        
-        print(f"   Peers: {metrics.connected_peers}/{self.max_peers}")
-        print(f"   Bandwidth: {metrics.total_bandwidth_mbps:.2f} Mbps")
-        print(f"   Latency: {metrics.avg_latency_ms:.1f}ms")
-        print(f"   Block Rate: {metrics.blocks_synced_per_minute:.1f} blocks/min")
+        log.info(
+            "📊 [Performance] Peers: %d/%d | Bandwidth: %.2f Mbps | Latency: %.1fms (p99 %.1fms) | "
+            "Block Rate: %.1f blocks/min",
+            metrics.connected_peers, self.max_peers, metrics.total_bandwidth_mbps,
+            metrics.avg_latency_ms, metrics.p99_latency_ms, metrics.blocks_synced_per_minute,
+        )
 
     async def optimize_peer_connections(self):
         """Optimize peer connection management"""
-        print("🔗 [Connection] Optimizing peer pool...")
-        
-        if len(self.peer_latencies) < self.max_peers * 0.8:
-            print(f"   🟢 Peer pool healthy ({len(self.peer_latencies)}/{self.max_peers})")
+        if len(self.peer_latencies) < self._peer_soft_limit:
+            log.info("🔗 [Connection] Peer pool healthy (%d/%d)", len(self.peer_latencies), self.max_peers)
             return
         
-        # Sort peers by latency
-        sorted_peers = sorted(self.peer_latencies.items(), key=lambda x: x[1])
-        
-        # Keep best performers
-        good_peers = [p for p, latency in sorted_peers if latency < 100][:self.max_outbound]
+        # Keep best performers: the index is already ordered by latency
+        cutoff = min(bisect.bisect_left(self._latency_index, (100,)), self.max_outbound)
+        good_peers = [p for _, p in self._latency_index[:cutoff]]
         
-        print(f"   ✅ Selected {len(good_peers)} optimal peers (avg latency < 100ms)")
+        log.info("🔗 [Connection] Selected %d optimal peers (avg latency < 100ms)", len(good_peers))
         
         # Calculate peer diversity
         peer_count = len(self.peer_latencies)
-        if peer_count > self.max_peers * 0.9:
-            print(f"   ⚠️  Peer pool near capacity, pruning low-performing peers...")
+        if peer_count > self._peer_hard_limit:
+            log.warning("🔗 [Connection] Peer pool near capacity, pruning low-performing peers...")
             # Disconnect from worst-performing peers when near capacity
             self.prune_poor_performers()
 
     async def optimize_bandwidth(self):
         """Optimize bandwidth usage"""
-        print("📈 [Bandwidth] Optimizing throughput...")
-        
         avg_throughput = self.calculate_avg_throughput()
         
         if avg_throughput < 1.0:
-            print(f"   ⚠️  Low bandwidth: {avg_throughput:.2f} Mbps")
-            print(f"   → Enabling block compression")
-            print(f"   → Batching transactions")
+            log.warning(
+                "📈 [Bandwidth] Low bandwidth: %.2f Mbps → enabling block compression, batching transactions",
+                avg_throughput,
+            )
         elif avg_throughput > 50.0:
-            print(f"   🚀 High bandwidth: {avg_throughput:.2f} Mbps")
-            print(f"   → Disabling compression for speed")
+            log.info("📈 [Bandwidth] High bandwidth: %.2f Mbps → disabling compression for speed", avg_throughput)
         else:
-            print(f"   ✅ Optimal bandwidth: {avg_throughput:.2f} Mbps")
+            log.info("📈 [Bandwidth] Optimal bandwidth: %.2f Mbps", avg_throughput)
 
     async def detect_congestion(self):
         """Detect network congestion"""
         if len(self.metrics_history) < 5:
             return
         
-        recent_metrics = self.metrics_history[-5:]
-        avg_latency = sum(m.avg_latency_ms for m in recent_metrics) / len(recent_metrics)
+        avg_latency = sum(m.avg_latency_ms for m in self._recent_metrics(5)) / 5
         
         if avg_latency > 500:
             self.congestion_detected = True
-            print(f"🚨 [Congestion] Network congestion detected! Avg latency: {avg_latency:.1f}ms")
-            print(f"   → Reducing block size")
-            print(f"   → Implementing backpressure")
-            print(f"   → Prioritizing critical messages")
+            log.warning(
+                "🚨 [Congestion] Network congestion detected! Avg latency: %.1fms (p99 %.1fms) → "
+                "reducing block size, implementing backpressure, prioritizing critical messages",
+                avg_latency, self.metrics_history[-1].p99_latency_ms,
+            )
         elif avg_latency < 200:
             self.congestion_detected = False
-            print(f"✅ [Congestion] Network cleared")
+            log.info("✅ [Congestion] Network cleared")
 
     def optimize_block_propagation(self, block_size_kb: int) -> Dict:
         """Optimize block propagation strategy"""
@@ -178,7 +210,24 @@ class NetworkBooster:
 
     def record_peer_latency(self, peer_id: str, latency_ms: float):
         """Record peer latency"""
+        # NaN/inf would break the ordering the sorted index relies on
+        if not math.isfinite(latency_ms):
+            log.warning("[NetworkBooster] Ignoring non-finite latency %r from %s", latency_ms, peer_id)
+            return
+        
+        old_latency = self.peer_latencies.get(peer_id)
+        if old_latency is not None:
+            pos = bisect.bisect_left(self._latency_index, (old_latency, peer_id))
+            assert self._latency_index[pos] == (old_latency, peer_id), "latency index out of sync"
+            # Keep using the interned key stored on first insert
+            _, peer_id = self._latency_index.pop(pos)
+            self._latency_sum -= old_latency
+        else:
+            # Share one interned key between the dict and the sorted index
+            peer_id = sys.intern(peer_id)
         self.peer_latencies[peer_id] = latency_ms
+        bisect.insort(self._latency_index, (latency_ms, peer_id))
+        self._latency_sum += latency_ms
 
     def record_throughput(self, peer_id: str, mbps: float):
         """Record peer throughput"""
@@ -192,7 +241,14 @@ class NetworkBooster:
         """Calculate average latency across peers"""
         if not self.peer_latencies:
             return 0.0
-        return sum(self.peer_latencies.values()) / len(self.peer_latencies)
+        return self._latency_sum / len(self.peer_latencies)
+
+    def calculate_latency_percentile(self, percentile: float) -> float:
+        """Nearest-rank latency percentile, read straight off the sorted index"""
+        if not self._latency_index:
+            return 0.0
+        rank = math.ceil(percentile / 100 * len(self._latency_index))
+        return self._latency_index[min(max(rank, 1), len(self._latency_index)) - 1][0]
 
     def calculate_avg_throughput(self) -> float:
         """Calculate average throughput"""
@@ -215,7 +271,11 @@ class NetworkBooster:
 
     def count_failed_connections(self) -> int:
         """Count failed connection attempts from metrics history"""
-        return sum(m.failed_connections for m in self.metrics_history[-5:])
+        return sum(m.failed_connections for m in self._recent_metrics(5))
+
+    def _recent_metrics(self, count: int) -> Iterator[NetworkMetrics]:
+        """Iterate over the newest `count` metrics without copying the history"""
+        return itertools.islice(reversed(self.metrics_history), count)
 
     def count_successful_connections(self) -> int:
         """Count successful connections"""
@@ -255,14 +315,14 @@ class NetworkBooster:
         if len(self.peer_latencies) <= self.max_outbound:
             return
         
-        # Sort by latency and keep top performers
-        sorted_peers = sorted(self.peer_latencies.items(), key=lambda x: x[1])
-        keep_peers = dict(sorted_peers[:self.max_outbound])
-        
-        removed = set(self.peer_latencies.keys()) - set(keep_peers.keys())
-        self.peer_latencies = keep_peers
+        # Drop everything past the best max_outbound entries of the index
+        removed = self._latency_index[self.max_outbound:]
+        for latency, peer_id in removed:
+            del self.peer_latencies[peer_id]
+            self._latency_sum -= latency
+        del self._latency_index[self.max_outbound:]
         
-        print(f"   Removed {len(removed)} low-performing peers")
+        log.info("🔗 [Connection] Removed %d low-performing peers", len(removed))
 
     def log_network_metrics(self):
         """Log network performance metrics"""
@@ -271,30 +331,30 @@ class NetworkBooster:
         
         latest = self.metrics_history[-1]
         
-        print("\n" + "="*60)
-        print("📊 NETWORK PERFORMANCE METRICS")
-        print("="*60)
-        print(f"Connected Peers:       {latest.connected_peers}/{self.max_peers}")
-        print(f"Bandwidth:             {latest.total_bandwidth_mbps:.2f} Mbps")
-        print(f"Average Latency:       {latest.avg_latency_ms:.1f} ms")
-        print(f"Block Sync Rate:       {latest.blocks_synced_per_minute:.1f} blocks/min")
-        print(f"Successful Conn:       {latest.successful_connections}")
-        print(f"Failed Connections:    {latest.failed_connections}")
-        print(f"Memory Usage:          {latest.memory_usage_percent:.1f}%")
-        print(f"Disk Usage:            {latest.disk_usage_percent:.1f}%")
-        print(f"Congestion Status:     {'🔴 DETECTED' if self.congestion_detected else '✅ CLEAR'}")
-        print("="*60 + "\n")
+        log.info(
+            "📊 NETWORK PERFORMANCE METRICS peers=%d/%d bandwidth_mbps=%.2f latency_ms=%.1f p99_latency_ms=%.1f "
+            "block_rate=%.1f successful_conn=%d failed_conn=%d memory_pct=%.1f disk_pct=%.1f congestion=%s",
+            latest.connected_peers, self.max_peers, latest.total_bandwidth_mbps, latest.avg_latency_ms,
+            latest.p99_latency_ms,
+            latest.blocks_synced_per_minute, latest.successful_connections, latest.failed_connections,
+            latest.memory_usage_percent, latest.disk_usage_percent,
+            "DETECTED" if self.congestion_detected else "CLEAR",
+        )
 
 
 async def run_network_booster(config_path: str):
     """Run the Network Booster agent"""
-    print("\n🚀 AXIOM NETWORK BOOSTER STARTING\n")
+    start_queue_logging()
+    log.info("🚀 AXIOM NETWORK BOOSTER STARTING")
     
     with open(config_path, 'r') as f:
         config = json.load(f)
     
     booster = NetworkBooster(config)
-    await booster.optimize_network()
+    try:
+        await booster.optimize_network()
+    finally:
+        stop_queue_logging()
 
 
 if __name__ == "__main__":
@@ -11,13 +11,28 @@ Usage:
 
 Requirements:
     pip install blake3
+    pip install orjson   # optional, zero-copy summary parsing
 """
 
-import hashlib
+import contextlib
+import functools
+import hmac
 import json
+import mmap
 import os
-import re
 import sys
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterator, List, Optional, Sequence, Union
+
+try:
+    import blake3 as _blake3
+except ImportError:  # reported by main()
+    _blake3 = None
+
+try:
+    import orjson as _orjson
+except ImportError:  # optional: faster, zero-copy summary parsing
+    _orjson = None
 
 # ---------------------------------------------------------------------------
 # Configuration
@@ -29,43 +44,250 @@ GENESIS_PULSE_PATH = os.path.join("config", "genesis_pulse.json")
 # Path to the Rust source that contains GENESIS_PULSE_HASH.
 LIB_RS_PATH = os.path.join("src", "lib.rs")
 
+# Name of the Rust constant holding the expected hash.
+_HASH_TOKEN = b"GENESIS_PULSE_HASH"
+
+# Bytes treated as whitespace when scanning the declaration.
+_WHITESPACE = b" \t\n\r\x0b\x0c"
+
+# Rust string continuation: a backslash-newline, which also swallows the
+# whitespace that follows it.
+_CONTINUATION = b"\\\n"
+
+# Digest length in bytes; src/lib.rs pins GENESIS_PULSE_HASH as a 512-bit
+# value.
+_DIGEST_LEN = 64
+
+# GENESIS_PULSE_HASH must be lowercase hex with no separators; the
+# original check compared hex strings exactly.
+_HEX_DIGITS = frozenset("0123456789abcdef")
+
+# Inputs smaller than this are hashed single-threaded: BLAKE3 only
+# splits work across threads for large inputs, and for a small file the
+# thread-pool setup costs more than it saves.
+_BLAKE3_THREAD_THRESHOLD = 1 << 20
+
+# Mapped files are handled as an mmap view, plain bytes when empty, or a
+# bytearray filled by pread when a non-empty file cannot be mapped.
+_Buffer = Union[bytes, bytearray, mmap.mmap]
+
 # If the script is invoked from a subdirectory, try to find the repo root.
 def _find_repo_root() -> str:
     """Walk upward until we find Cargo.toml (repo root marker)."""
     path = os.path.abspath(os.path.dirname(__file__))
-    for _ in range(10):
-        if os.path.isfile(os.path.join(path, "Cargo.toml")):
-            return path
-        path = os.path.dirname(path)
+    while True:
+        # One directory listing per level; DirEntry answers is_file()
+        # from the listing itself, without a stat() per candidate.
+        try:
+            with os.scandir(path) as entries:
+                if any(e.name == "Cargo.toml" and e.is_file() for e in entries):
+                    return path
+        except OSError:
+            pass
+        parent = os.path.dirname(path)
+        if parent == path:
+            break
+        path = parent
     # Fallback: current working directory
     return os.getcwd()
 
-REPO_ROOT = _find_repo_root()
+@functools.cache
+def repo_root() -> str:
+    """Repository root, located on first use rather than at import time."""
+    return _find_repo_root()
+
+
+@functools.cache
+def genesis_path() -> str:
+    """Absolute path of the genesis pulse file."""
+    return os.path.join(repo_root(), GENESIS_PULSE_PATH)
+
+
+@functools.cache
+def lib_rs_path() -> str:
+    """Absolute path of the Rust source holding GENESIS_PULSE_HASH."""
+    return os.path.join(repo_root(), LIB_RS_PATH)
 
 # ---------------------------------------------------------------------------
-# BLAKE3-512 (XOF) hashing
+# File access
 # ---------------------------------------------------------------------------
 
-def blake3_512_hex(data: bytes) -> str:
-    """Compute the 512-bit (64-byte) BLAKE3-XOF hash and return it as hex."""
+def _pread_all(fd: int, size: int) -> bytearray:
+    """Read size bytes of fd into one pre-sized bytearray, unbuffered."""
+    buf = bytearray(size)
+    n = 0
+    while n < size:
+        chunk = os.pread(fd, size - n, n)
+        if not chunk:  # file shrank underneath us
+            break
+        buf[n:n + len(chunk)] = chunk
+        n += len(chunk)
+    del buf[n:]
+    return buf
+
+
+@contextlib.contextmanager
+def _map_file(path: str) -> Iterator[_Buffer]:
+    """
+    Yield a read-only mmap of path, so the page cache is the only buffer.
+
+    mmap cannot map an empty file, so a file whose fstat size is 0 yields
+    b"". If mapping a non-empty file fails (a filesystem without mmap
+    support, or an mmap size limit), its fstat size is read with pread
+    into a bytearray instead, skipping the buffered-I/O layer.
+    Files without a real size, such as pipes and procfs entries, are not
+    supported.
+    """
+    fd = os.open(path, os.O_RDONLY)
     try:
-        import blake3
-        h = blake3.blake3(data)
-        return h.hexdigest(length=64)
-    except ImportError:
-        pass
-
-    # Fallback: use the hashlib interface available in Python 3.11+ or
-    # the blake3 PyPI package.  hashlib does not expose XOF for BLAKE3
-    # so we require the dedicated package.
-    print("ERROR: The 'blake3' Python package is required.")
-    print("       Install it with:  pip install blake3")
-    sys.exit(2)
+        size = os.fstat(fd).st_size
+        if size == 0:
+            yield b""
+            return
+        try:
+            mm = mmap.mmap(fd, 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            yield _pread_all(fd, size)
+            return
+        with mm:
+            yield mm
+    finally:
+        os.close(fd)
+
+# ---------------------------------------------------------------------------
+# BLAKE3-512 (XOF) hashing
+# ---------------------------------------------------------------------------
+
+def blake3_512_bytes(data: _Buffer) -> bytes:
+    """
+    Compute the 512-bit (64-byte) BLAKE3-XOF hash of data as raw bytes.
+
+    data may be an mmap view; BLAKE3 reads it through the buffer protocol
+    without copying. Inputs of _BLAKE3_THREAD_THRESHOLD bytes or more use
+    its multi-threaded SIMD tree hashing.
+    """
+    if len(data) >= _BLAKE3_THREAD_THRESHOLD:
+        h = _blake3.blake3(max_threads=_blake3.blake3.AUTO)
+    else:
+        h = _blake3.blake3(max_threads=1)
+    h.update(data)
+    return h.digest(length=_DIGEST_LEN)
+
+
+def _blake3_512_file(path: str) -> bytes:
+    """Single-threaded BLAKE3-512 of one mapped file (for the batch API)."""
+    with _map_file(path) as data:
+        h = _blake3.blake3(max_threads=1)
+        h.update(data)
+        return h.digest(length=_DIGEST_LEN)
+
+
+def blake3_512_many(paths: Sequence[str]) -> List[bytes]:
+    """
+    Compute BLAKE3-512 digests for several files, in input order.
+
+    Files are hashed concurrently, one per worker thread; blake3 releases
+    the GIL while compressing, so the SIMD kernels for different files
+    run in parallel instead of back to back.
+    """
+    if len(paths) <= 1:
+        return [_blake3_512_file(p) for p in paths]
+    with ThreadPoolExecutor(max_workers=min(len(paths), os.cpu_count() or 1)) as pool:
+        return list(pool.map(_blake3_512_file, paths))
+
+def _load_json(data: _Buffer):
+    """
+    Parse JSON straight from a mapped buffer.
+
+    orjson reads the mapping through a memoryview without copying; the
+    stdlib decoder only accepts str/bytes, so it gets one bytes copy.
+    """
+    if _orjson is not None:
+        with memoryview(data) as view:
+            return _orjson.loads(view)
+    return json.loads(data[:])
 
 # ---------------------------------------------------------------------------
 # Extract expected hash from Rust source
 # ---------------------------------------------------------------------------
 
+def _skip_ws(buf: _Buffer, i: int) -> int:
+    """Return the first offset at or after i that is not whitespace."""
+    n = len(buf)
+    while i < n and buf[i] in _WHITESPACE:
+        i += 1
+    return i
+
+
+def _is_pub_const(buf: _Buffer, name_at: int) -> bool:
+    """Check that `pub const ` (whitespace-separated) ends right at name_at."""
+    i = name_at
+    while i > 0 and buf[i - 1] in _WHITESPACE:
+        i -= 1
+    if i == name_at or i < 5 or buf[i - 5:i] != b"const":
+        return False
+
+    j = i - 5
+    i = j
+    while i > 0 and buf[i - 1] in _WHITESPACE:
+        i -= 1
+    return i != j and i >= 3 and buf[i - 3:i] == b"pub"
+
+
+def _read_str_literal(buf: _Buffer, i: int) -> Optional[str]:
+    """
+    Parse `: &str = "..."` starting at offset i and return the literal.
+
+    Backslash-newline continuations (and the whitespace after them) are
+    joined the way rustc does. Every other byte, including a lone
+    backslash or whitespace inside a piece, is kept so that a malformed
+    constant still fails the hex check in expected_hash_bytes().
+    """
+    for expected in (b":", b"&str", b"="):
+        i = _skip_ws(buf, i)
+        if buf[i:i + len(expected)] != expected:
+            return None
+        i += len(expected)
+
+    i = _skip_ws(buf, i)
+    if buf[i:i + 1] != b'"':
+        return None
+    i += 1
+
+    end = buf.find(b'"', i)
+    if end == -1:
+        return None
+    head, *pieces = buf[i:end].split(_CONTINUATION)
+    value = head + b"".join(p.lstrip(_WHITESPACE) for p in pieces)
+    value = value.strip(_WHITESPACE)
+    return value.decode() if value else None
+
+
+def _scan_genesis_hash(buf: _Buffer) -> Optional[str]:
+    """Find `pub const GENESIS_PULSE_HASH: &str = "..."` in buf."""
+    at = buf.find(_HASH_TOKEN)
+    while at != -1:
+        if _is_pub_const(buf, at):
+            value = _read_str_literal(buf, at + len(_HASH_TOKEN))
+            if value:
+                return value
+        at = buf.find(_HASH_TOKEN, at + 1)
+    return None
+
+
+@functools.lru_cache(maxsize=4)
+def _parse_expected_hash(lib_rs: str, mtime_ns: int) -> Optional[str]:
+    """
+    Return GENESIS_PULSE_HASH from the given lib.rs, or None if absent.
+
+    The file is memory-mapped and scanned forward once; no decoded copy
+    of the source is built. Cached per (path, mtime_ns), so repeated
+    calls only re-parse the file after it has changed on disk.
+    """
+    with _map_file(lib_rs) as source:
+        return _scan_genesis_hash(source)
+
+
 def extract_expected_hash() -> str:
     """
     Parse src/lib.rs and extract the GENESIS_PULSE_HASH constant.
@@ -75,87 +297,142 @@ def extract_expected_hash() -> str:
             "3f178ac4...\\
              3a6b1524...";
     """
-    lib_rs = os.path.join(REPO_ROOT, LIB_RS_PATH)
+    lib_rs = lib_rs_path()
     if not os.path.isfile(lib_rs):
-        print(f"ERROR: Cannot find {LIB_RS_PATH} (looked in {REPO_ROOT})")
+        print(f"ERROR: Cannot find {LIB_RS_PATH} (looked in {repo_root()})", file=sys.stderr)
         sys.exit(3)
 
-    with open(lib_rs, "r") as f:
-        source = f.read()
-
-    # Match the constant across lines, capturing concatenated string pieces.
-    pattern = r'pub\s+const\s+GENESIS_PULSE_HASH\s*:\s*&str\s*=\s*"([^"]+)"'
-    # Because the string may span lines with backslash continuation, we
-    # first collapse backslash-newline-whitespace sequences.
-    collapsed = re.sub(r'\\\n\s*', '', source)
-    match = re.search(pattern, collapsed)
-    if not match:
-        print("ERROR: Could not locate GENESIS_PULSE_HASH in src/lib.rs")
+    expected = _parse_expected_hash(lib_rs, os.stat(lib_rs).st_mtime_ns)
+    if expected is None:
+        print("ERROR: Could not locate GENESIS_PULSE_HASH in src/lib.rs", file=sys.stderr)
         sys.exit(3)
 
-    return match.group(1).strip()
+    return expected
+
+
+def expected_hash_bytes() -> bytes:
+    """
+    Return GENESIS_PULSE_HASH decoded to its _DIGEST_LEN raw bytes.
+
+    The constant is validated here, before any hashing, so that once the
+    digest is ready the decision is a single compare.
+    """
+    expected_hash = extract_expected_hash()
+    # bytes.fromhex would also accept uppercase and embedded whitespace.
+    if len(expected_hash) != 2 * _DIGEST_LEN or not _HEX_DIGITS.issuperset(expected_hash):
+        print("ERROR: GENESIS_PULSE_HASH in src/lib.rs is not a lowercase 512-bit hex digest "
+              f"({expected_hash!r})", file=sys.stderr)
+        sys.exit(3)
+    return bytes.fromhex(expected_hash)
+
+# ---------------------------------------------------------------------------
+# Output
+# ---------------------------------------------------------------------------
+
+@functools.cache
+def _rich_output() -> bool:
+    """True when stdout is a terminal whose encoding can render the markers."""
+    try:
+        "—📄🔑📌✅❌".encode(sys.stdout.encoding or "ascii")
+    except (UnicodeEncodeError, LookupError):
+        return False
+    return sys.stdout.isatty()
+
+
+def _mark(symbol: str, fallback: str) -> str:
+    """Pick the Unicode marker or its ASCII fallback for this stdout."""
+    return symbol if _rich_output() else fallback
+
+
+def _write(lines: List[str]) -> None:
+    """Emit buffered report lines with a single write."""
+    sys.stdout.write("\n".join(lines) + "\n")
+    sys.stdout.flush()
 
 # ---------------------------------------------------------------------------
 # Main
 # ---------------------------------------------------------------------------
 
 def main() -> int:
-    print("=" * 64)
-    print("  AXIOM PROTOCOL — Genesis Pulse Verification")
-    print("=" * 64)
-    print()
-
-    # 1. Locate and read genesis_pulse.json
-    genesis_path = os.path.join(REPO_ROOT, GENESIS_PULSE_PATH)
-    if not os.path.isfile(genesis_path):
-        print(f"❌ INTEGRITY BREACH: {GENESIS_PULSE_PATH} not found!")
+    # hashlib does not expose XOF output for BLAKE3, so the dedicated
+    # package is required.
+    if _blake3 is None:
+        print("ERROR: The 'blake3' Python package is required.\n"
+              "       Install it with:  pip install blake3", file=sys.stderr)
+        return 2
+
+    # Read and validate the expected hash first; exits with an error if
+    # it is missing or malformed.
+    expected = expected_hash_bytes()
+
+    out: List[str] = [
+        "=" * 64,
+        f"  AXIOM PROTOCOL {_mark('—', '-')} Genesis Pulse Verification",
+        "=" * 64,
+        "",
+    ]
+
+    # 1. Locate and map genesis_pulse.json
+    path = genesis_path()
+    if not os.path.isfile(path):
+        _write(out)
+        print(f"{_mark('❌', '[FAIL]')} INTEGRITY BREACH: {GENESIS_PULSE_PATH} not found!",
+              file=sys.stderr)
         return 1
 
-    with open(genesis_path, "rb") as f:
-        genesis_bytes = f.read()
+    with _map_file(path) as pulse:
+        return _verify(pulse, expected, out)
+
 
-    print(f"📄 File:     {GENESIS_PULSE_PATH}")
-    print(f"   Size:     {len(genesis_bytes)} bytes")
+def _verify(pulse: _Buffer, expected: bytes, out: List[str]) -> int:
+    """Hash the mapped genesis pulse, compare it and report the result."""
+    out.append(f"{_mark('📄', '[file]')} File:     {GENESIS_PULSE_PATH}")
+    out.append(f"   Size:     {len(pulse)} bytes")
 
     # 2. Compute BLAKE3-512 hash
-    computed_hash = blake3_512_hex(genesis_bytes)
-    print(f"🔑 Computed: {computed_hash}")
+    computed = blake3_512_bytes(pulse)
+    out.append(f"{_mark('🔑', '[hash]')} Computed: {computed.hex()}")
 
-    # 3. Extract expected hash from source
-    expected_hash = extract_expected_hash()
-    print(f"📌 Expected: {expected_hash}")
-    print()
-
-    # 4. Compare
-    if computed_hash == expected_hash:
-        print("✅ FOUNDATION VERIFIED")
-        print()
-        print("   The genesis pulse file matches the hardcoded")
-        print("   GENESIS_PULSE_HASH in src/lib.rs.")
-        print("   The 124M supply chain is anchored to Block 0.")
-        print()
+    # 3. Expected hash from source
+    out.append(f"{_mark('📌', '[want]')} Expected: {expected.hex()}")
+    out.append("")
+
+    # 4. Compare raw digests in constant time
+    if hmac.compare_digest(computed, expected):
+        out += [
+            f"{_mark('✅', '[OK]')} FOUNDATION VERIFIED",
+            "",
+            "   The genesis pulse file matches the hardcoded",
+            "   GENESIS_PULSE_HASH in src/lib.rs.",
+            "   The 124M supply chain is anchored to Block 0.",
+            "",
+        ]
 
         # Parse and display key genesis data for human verification.
         try:
-            genesis = json.loads(genesis_bytes)
-            print("   Genesis Summary:")
-            print(f"     Protocol:  {genesis.get('protocol', 'N/A')}")
-            print(f"     Version:   {genesis.get('version', 'N/A')}")
+            genesis = _load_json(pulse)
             supply = genesis.get("supply", {})
-            print(f"     Supply:    {supply.get('total_supply_axm', 'N/A')} AXM")
-            print(f"     Timestamp: {genesis.get('genesis_timestamp_utc', 'N/A')}")
+            out += [
+                "   Genesis Summary:",
+                f"     Protocol:  {genesis.get('protocol', 'N/A')}",
+                f"     Version:   {genesis.get('version', 'N/A')}",
+                f"     Supply:    {supply.get('total_supply_axm', 'N/A')} AXM",
+                f"     Timestamp: {genesis.get('genesis_timestamp_utc', 'N/A')}",
+            ]
         except json.JSONDecodeError:
             pass
 
+        _write(out)
         return 0
     else:
-        print("❌ INTEGRITY BREACH")
-        print()
-        print("   The computed BLAKE3-512 hash does NOT match the")
-        print("   expected GENESIS_PULSE_HASH in src/lib.rs.")
-        print()
-        print("   The genesis pulse file may have been tampered with.")
-        print("   Do NOT trust this node's supply chain anchor.")
+        _write(out)
+        print(f"{_mark('❌', '[FAIL]')} INTEGRITY BREACH\n"
+              "\n"
+              "   The computed BLAKE3-512 hash does NOT match the\n"
+              "   expected GENESIS_PULSE_HASH in src/lib.rs.\n"
+              "\n"
+              "   The genesis pulse file may have been tampered with.\n"
+              "   Do NOT trust this node's supply chain anchor.", file=sys.stderr)
         return 1
 
 